@@ -1,112 +1,62 @@
-import re
+import numpy as np
 import streamlit as st
 import pandas as pd
 
+from budget_core import (
+    COLUMNS,
+    DISPLAY_INDEX,
+    DISPLAY_ITEMS,
+    DISPLAY_TO_VALUE,
+    DISPLAY_TO_VALUE_KEYS,
+    FIRST_SUB_DISPLAY,
+    GUIDE_MD,
+    NUMERIC_DTYPES,
+    build_csv,
+    empty_expense_cols,
+    validate_club_info,
+)
+
 st.set_page_config(page_title="ASOIT Budget Builder", layout="wide")
 st.title("ASOIT Budget Builder")
 
-# -----------------------------
-# Category definitions
-# -----------------------------
-CATEGORY_TREE = {
-    "Capital Expenses": [
-        "Computers",
-        "Equipment reusable parts",
-        "Storage totes",
-        "Items that cost more than organizational supplies and will last more than one year",
-    ],
-    "Organizational Supplies": [
-        "National membership dues",
-        "Office supplies",
-        "Gloves/masks",
-        "Items needed for general club operations that aren’t for an event and won’t last more than one year",
-    ],
-    "Marketing Expenses": [
-        "Printing costs",
-        "Banners/trifolds",
-        "Decorations for a campus display",
-        "Promotional materials that aren’t club gear",
-    ],
-    "Club Gear": [
-        "T-shirts",
-        "Sweatshirts",
-        "Jackets",
-        "Wearable items featuring your club’s logo",
-    ],
-    "Event Supplies": [
-        "Food/snacks",
-        "Decorations",
-        "Items needed to host and run events",
-    ],
-}
-
-INDENT = "   "
-
-
-def header_style(main: str) -> str:
-    # This is the "fake bold" header style for dropdown display
-    return f"▌ {main.upper()}"
-
-
-def build_category_dropdown_items(tree):
-    display_items = []
-    display_to_value = {}
-
-    for main, subs in tree.items():
-        header = header_style(main)
-        display_items.append(header)
-
-        for sub in subs:
-            display = f"{INDENT}{sub}"
-            display_items.append(display)
-            display_to_value[display] = f"{main}/{sub}"
-
-        display_items.append("")  # spacer line
-
-    while display_items and display_items[-1] == "":
-        display_items.pop()
-
-    return display_items, display_to_value
-
-
-DISPLAY_ITEMS, DISPLAY_TO_VALUE = build_category_dropdown_items(CATEGORY_TREE)
-
-# -----------------------------
-# Validation helpers
-# -----------------------------
-EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
-
-
-def is_valid_email(s: str) -> bool:
-    s = (s or "").strip()
-    return bool(EMAIL_RE.match(s))
-
-
 # -----------------------------
 # Club Info (required)
 # -----------------------------
 st.subheader("Club Info")
 
-club_col1, club_col2 = st.columns(2)
-with club_col1:
-    official_club_name = st.text_input("Official Club Name *", placeholder="e.g., ASOIT Robotics Club")
-    president_email = st.text_input("President Email *", placeholder="name@oit.edu")
-with club_col2:
-    treasurer_email = st.text_input("Treasurer Email *", placeholder="name@oit.edu")
-    advisor_email = st.text_input("Advisor Email *", placeholder="name@oit.edu")
-
-club_errors = []
-if official_club_name.strip() == "":
-    club_errors.append("Official Club Name is required.")
-if not is_valid_email(president_email):
-    club_errors.append("President Email must be a valid email address.")
-if not is_valid_email(treasurer_email):
-    club_errors.append("Treasurer Email must be a valid email address.")
-if not is_valid_email(advisor_email):
-    club_errors.append("Advisor Email must be a valid email address.")
+# Club Info lives in a form so typing in it doesn't rerun the whole page on every field change;
+# values are validated and persisted only when the form is submitted.
+if "club_info" not in st.session_state:
+    st.session_state.club_info = {
+        "Official Club Name": "",
+        "President Email": "",
+        "Treasurer Email": "",
+        "Advisor Email": "",
+    }
+    st.session_state.club_errors = validate_club_info(st.session_state.club_info)
+
+with st.form("club_info_form"):
+    club_col1, club_col2 = st.columns(2)
+    with club_col1:
+        official_club_name = st.text_input("Official Club Name *", placeholder="e.g., ASOIT Robotics Club")
+        president_email = st.text_input("President Email *", placeholder="name@oit.edu")
+    with club_col2:
+        treasurer_email = st.text_input("Treasurer Email *", placeholder="name@oit.edu")
+        advisor_email = st.text_input("Advisor Email *", placeholder="name@oit.edu")
+
+    if st.form_submit_button("Save Club Info"):
+        st.session_state.club_info = {
+            "Official Club Name": official_club_name.strip(),
+            "President Email": president_email.strip(),
+            "Treasurer Email": treasurer_email.strip(),
+            "Advisor Email": advisor_email.strip(),
+        }
+        st.session_state.club_errors = validate_club_info(st.session_state.club_info)
+
+club_errors = st.session_state.club_errors
 
 if club_errors:
-    st.warning("Please complete the required Club Info fields before exporting or adding items.")
+    st.warning("Please complete and save the required Club Info fields before exporting or adding items.")
     for e in club_errors:
         st.caption(f"• {e}")
 
@@ -118,28 +68,23 @@ st.divider()
 st.subheader("What goes where?")
 st.caption("Use this guide when selecting an expense category:")
 
-main_categories = list(CATEGORY_TREE.keys())
-cols = st.columns(len(main_categories))
+cols = st.columns(len(GUIDE_MD))
 
-for i, main in enumerate(main_categories):
-    with cols[i]:
-        st.markdown(f"### {main}")
-        for sub in CATEGORY_TREE[main]:
-            st.markdown(f"- {sub}")
+for col, md in zip(cols, GUIDE_MD):
+    with col:
+        st.markdown(md)
 
 st.divider()
 
 # -----------------------------
 # Initialize state
 # -----------------------------
-if "expenses_df" not in st.session_state:
-    st.session_state.expenses_df = pd.DataFrame(
-        columns=["Expense Category", "Description", "Qty.", "Amount", "Total Amount"]
-    )
+# Line items are kept column-wise (one list per column); a DataFrame is only built for display/export.
+if "expenses_cols" not in st.session_state:
+    st.session_state.expenses_cols = empty_expense_cols()
 
 if "last_valid_category_display" not in st.session_state:
-    first_valid = next((x for x in DISPLAY_ITEMS if x in DISPLAY_TO_VALUE), None)
-    st.session_state.last_valid_category_display = first_valid
+    st.session_state.last_valid_category_display = FIRST_SUB_DISPLAY
 
 # -----------------------------
 # Add line item form
@@ -150,9 +95,7 @@ with st.form("add_expense", clear_on_submit=True):
     selected_display = st.selectbox(
         "Expense Category *",
         DISPLAY_ITEMS,
-        index=DISPLAY_ITEMS.index(st.session_state.last_valid_category_display)
-        if st.session_state.last_valid_category_display in DISPLAY_ITEMS
-        else 0,
+        index=DISPLAY_INDEX.get(st.session_state.last_valid_category_display, 0),
     )
 
     description = st.text_input("Description *", placeholder="Required (e.g., Pizza for volunteer meeting)")
@@ -171,7 +114,7 @@ with st.form("add_expense", clear_on_submit=True):
     if submitted:
         if club_errors:
             st.error("Fix Club Info fields above before adding line items.")
-        elif selected_display not in DISPLAY_TO_VALUE:
+        elif selected_display not in DISPLAY_TO_VALUE_KEYS:
             st.error("Please select a sub-category (the indented items), not a main header.")
         elif not description.strip():
             st.error("Description is required.")
@@ -186,59 +129,97 @@ with st.form("add_expense", clear_on_submit=True):
                 "Total Amount": float(total_amount),
             }
 
-            st.session_state.expenses_df = pd.concat(
-                [st.session_state.expenses_df, pd.DataFrame([new_row])],
-                ignore_index=True,
-            )
+            for col, value in new_row.items():
+                st.session_state.expenses_cols[col].append(value)
+            st.session_state.pop("_last_editor_sig", None)
 
 # -----------------------------
 # Table + editing
 # -----------------------------
 st.subheader("Budget Line Items")
 
-df = st.session_state.expenses_df.copy()
+# Stored rows are always coerced after editing, so a single typed cast is enough here
+df = pd.DataFrame(st.session_state.expenses_cols, columns=COLUMNS).astype(NUMERIC_DTYPES)
 
 if df.empty:
     st.info("No line items yet. Add one above.")
 else:
-    for col in ["Qty.", "Amount", "Total Amount"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-    edited_df = st.data_editor(
-        df,
-        use_container_width=True,
-        num_rows="dynamic",
-        disabled=["Total Amount"],
-        key="budget_editor",
+    money_config = {
+        "Amount": st.column_config.NumberColumn(format="$%.2f"),
+        "Total Amount": st.column_config.NumberColumn(format="$%.2f"),
+    }
+
+    # st.data_editor is much heavier than st.dataframe, so only mount it while editing
+    if st.toggle("Edit rows", value=False, key="edit_mode"):
+        edited_df = st.data_editor(
+            df,
+            use_container_width=True,
+            num_rows="dynamic",
+            disabled=["Total Amount"],
+            column_config=money_config,
+            key="budget_editor",
+        )
+    else:
+        st.dataframe(df, use_container_width=True, column_config=money_config)
+        edited_df = df
+
+    # Streamlit exposes the editor's pending deltas in session state; when they match the last
+    # rerun (and no row was added/cleared since), the stored columns are already up to date.
+    editor_state = st.session_state.get("budget_editor") or {}
+    editor_sig = repr(
+        (
+            editor_state.get("edited_rows"),
+            editor_state.get("added_rows"),
+            editor_state.get("deleted_rows"),
+        )
     )
 
-    for col in ["Qty.", "Amount"]:
-        edited_df[col] = pd.to_numeric(edited_df[col], errors="coerce").fillna(0)
+    if st.session_state.get("_last_editor_sig") != editor_sig:
+        # One coerce per column straight to NumPy, then a single vectorized multiply
+        qty_arr = pd.to_numeric(edited_df["Qty."], errors="coerce").to_numpy(dtype=np.float64, na_value=0.0)
+        qty_arr = qty_arr.astype(np.int64)
+        amount_arr = pd.to_numeric(edited_df["Amount"], errors="coerce").to_numpy(dtype=np.float64, na_value=0.0)
+
+        edited_df["Qty."] = qty_arr
+        edited_df["Amount"] = amount_arr
+        total_arr = qty_arr * amount_arr
+        edited_df["Total Amount"] = total_arr
+
+        # Single pass over the raw values; None/NaN and whitespace-only strings count as blank
+        blank_desc = np.array(
+            [not (isinstance(v, str) and v.strip()) for v in edited_df["Description"].to_numpy()],
+            dtype=bool,
+        )
+
+        st.session_state.expenses_cols = edited_df.to_dict("list")
+
+        # Sum the same Total Amount values that are displayed and exported
+        grand_total = float(total_arr.sum())
 
-    edited_df["Total Amount"] = edited_df["Qty."] * edited_df["Amount"]
+        st.session_state._last_rows = tuple(edited_df.itertuples(index=False, name=None))
+        st.session_state._last_rows_hash = hash(st.session_state._last_rows)
+        st.session_state._last_blank = bool(blank_desc.any())
+        st.session_state._last_total = f"${grand_total:,.2f}"
+        st.session_state._last_editor_sig = editor_sig
 
-    blank_desc = edited_df["Description"].fillna("").str.strip() == ""
-    if blank_desc.any():
+    if st.session_state._last_blank:
         st.warning("One or more rows have a blank Description. Please fill them in before exporting.")
 
-    st.session_state.expenses_df = edited_df
+    # Only re-encode when the rows or club info actually changed since the last rerun
+    club_info = tuple(st.session_state.club_info.values())
+    sig = (len(st.session_state._last_rows), st.session_state._last_rows_hash, club_info)
 
-    grand_total = float(edited_df["Total Amount"].sum())
-    st.metric("Grand Total", f"${grand_total:,.2f}")
+    if st.session_state.get("_last_sig") != sig:
+        st.session_state._last_csv = build_csv(st.session_state._last_rows, *club_info)
+        st.session_state._last_sig = sig
 
-    # Export with club info on every row (self-contained CSV)
-    export_df = edited_df.copy()
-    export_df.insert(0, "Official Club Name", official_club_name.strip())
-    export_df.insert(1, "President Email", president_email.strip())
-    export_df.insert(2, "Treasurer Email", treasurer_email.strip())
-    export_df.insert(3, "Advisor Email", advisor_email.strip())
+    st.metric("Grand Total", st.session_state._last_total)
 
-    can_export = (not club_errors) and (not blank_desc.any())
+    can_export = (not club_errors) and (not st.session_state._last_blank)
 
-    csv_bytes = export_df.to_csv(index=False).encode("utf-8")
     st.download_button(
         label="Download CSV",
-        data=csv_bytes,
+        data=st.session_state._last_csv,
         file_name="budget_line_items.csv",
         mime="text/csv",
         disabled=not can_export,
@@ -246,5 +227,6 @@ else:
     )
 
     if st.button("Clear all line items"):
-        st.session_state.expenses_df = st.session_state.expenses_df.iloc[0:0]
+        st.session_state.expenses_cols = empty_expense_cols()
+        st.session_state.pop("_last_editor_sig", None)
         st.rerun()
@@ -0,0 +1,163 @@
+"""Shared budget data and helpers for the ASOIT Budget Builder UI.
+
+Streamlit re-executes app.py on every interaction but imports this module only once per
+process, so the category tables, compiled regexes and cached export live here.
+"""
+
+import io
+import re
+import sys
+from types import MappingProxyType
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import streamlit as st
+import pandas as pd
+
+# -----------------------------
+# Category definitions
+# -----------------------------
+CATEGORY_TREE = {
+    "Capital Expenses": [
+        "Computers",
+        "Equipment reusable parts",
+        "Storage totes",
+        "Items that cost more than organizational supplies and will last more than one year",
+    ],
+    "Organizational Supplies": [
+        "National membership dues",
+        "Office supplies",
+        "Gloves/masks",
+        "Items needed for general club operations that aren’t for an event and won’t last more than one year",
+    ],
+    "Marketing Expenses": [
+        "Printing costs",
+        "Banners/trifolds",
+        "Decorations for a campus display",
+        "Promotional materials that aren’t club gear",
+    ],
+    "Club Gear": [
+        "T-shirts",
+        "Sweatshirts",
+        "Jackets",
+        "Wearable items featuring your club’s logo",
+    ],
+    "Event Supplies": [
+        "Food/snacks",
+        "Decorations",
+        "Items needed to host and run events",
+    ],
+}
+
+INDENT = "   "
+
+COLUMNS = ["Expense Category", "Description", "Qty.", "Amount", "Total Amount"]
+NUMERIC_DTYPES = {"Qty.": "int64", "Amount": "float64", "Total Amount": "float64"}
+
+
+def header_style(main: str) -> str:
+    # This is the "fake bold" header style for dropdown display
+    return f"▌ {main.upper()}"
+
+
+def build_category_dropdown_items(tree):
+    display_items = []
+    display_to_value = {}
+
+    for main, subs in tree.items():
+        header = sys.intern(header_style(main))
+        display_items.append(header)
+
+        for sub in subs:
+            display = sys.intern(f"{INDENT}{sub}")
+            display_items.append(display)
+            display_to_value[display] = f"{main}/{sub}"
+
+        display_items.append("")  # spacer line
+
+    while display_items and display_items[-1] == "":
+        display_items.pop()
+
+    return tuple(display_items), MappingProxyType(display_to_value)
+
+
+DISPLAY_ITEMS, DISPLAY_TO_VALUE = build_category_dropdown_items(CATEGORY_TREE)
+DISPLAY_TO_VALUE_KEYS = frozenset(DISPLAY_TO_VALUE)
+DISPLAY_INDEX = {s: i for i, s in enumerate(DISPLAY_ITEMS)}
+FIRST_SUB_DISPLAY = next(x for x in DISPLAY_ITEMS if x in DISPLAY_TO_VALUE_KEYS)
+
+# One markdown blob per guide column (header + bullet list) so each column is a single element
+GUIDE_MD = tuple(
+    f"### {main}\n" + "\n".join(f"- {sub}" for sub in subs) for main, subs in CATEGORY_TREE.items()
+)
+
+# -----------------------------
+# Validation helpers
+# -----------------------------
+# Used with fullmatch: a "$" anchor would also accept a trailing newline in the local part
+_LOCAL_RE = re.compile(r"[^@\s]+")
+_DOMAIN_RE = re.compile(r"[^@\s]+\.[^@\s]+")
+
+
+def is_valid_email(s: str) -> bool:
+    s = (s or "").strip()
+    # Cheap prefilter so empty / partially typed values never reach the regex engine
+    if "@" not in s:
+        return False
+    local, _, domain = s.partition("@")
+    if "." not in domain:
+        return False
+    return bool(_LOCAL_RE.fullmatch(local) and _DOMAIN_RE.fullmatch(domain))
+
+
+def validate_club_info(info) -> list:
+    errors = []
+    if info["Official Club Name"].strip() == "":
+        errors.append("Official Club Name is required.")
+    if not is_valid_email(info["President Email"]):
+        errors.append("President Email must be a valid email address.")
+    if not is_valid_email(info["Treasurer Email"]):
+        errors.append("Treasurer Email must be a valid email address.")
+    if not is_valid_email(info["Advisor Email"]):
+        errors.append("Advisor Email must be a valid email address.")
+    return errors
+
+
+# -----------------------------
+# Expenses state helpers
+# -----------------------------
+def empty_expense_cols() -> dict:
+    # Line items are kept column-wise (one list per column)
+    return {col: [] for col in COLUMNS}
+
+
+# -----------------------------
+# Export helpers
+# -----------------------------
+# The cache is process-wide and shared by all sessions, so bound it; each session also keeps
+# its own latest export in st.session_state._last_csv.
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def build_csv(rows_tuple, club_name, pres, treas, adv) -> bytes:
+    # Cached on the row values + club info so unrelated reruns reuse the encoded bytes
+    columns = zip(*rows_tuple) if rows_tuple else ([] for _ in COLUMNS)
+
+    # Export with club info on every row (self-contained CSV); the scalars broadcast over the
+    # row columns, so the frame is built in one go instead of copy + four inserts
+    df = pd.DataFrame(
+        {
+            "Official Club Name": club_name,
+            "President Email": pres,
+            "Treasurer Email": treas,
+            "Advisor Email": adv,
+            **dict(zip(COLUMNS, columns)),
+        }
+    )
+
+    # Arrow's C++ CSV writer (already installed alongside Streamlit) instead of pandas' Python one.
+    # The values are the same but the format is not DataFrame.to_csv's: every header and string
+    # field is double-quoted, and floats use Arrow's shortest round-trip formatting, which drops
+    # ".0" (0.0 -> "0", -0.0 -> "-0") and switches to/from exponent notation at different
+    # thresholds (1e-05 -> "0.00001", 1000000000000.0 -> "1e+12").
+    buf = io.BytesIO()
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue()